@@ -0,0 +1,72 @@
+import asyncio
+import unittest
+
+from tool import UrlChecker
+
+
+def make_reader(data):
+    """Create a stream reader that yields data and then EOF"""
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+class ReadHeadResponseTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.checker = UrlChecker(pipeline=True)
+
+    async def read(self, data):
+        return await self.checker._read_head_response(make_reader(data))
+
+    async def test_keep_alive(self):
+        response = b'HTTP/1.1 200 OK\r\nContent-Length: 12\r\n\r\n'
+        self.assertEqual(await self.read(response), (200, 'OK', True))
+
+    async def test_connection_close(self):
+        response = b'HTTP/1.1 404 Not Found\r\nConnection: close\r\n\r\n'
+        self.assertEqual(await self.read(response), (404, 'Not Found', False))
+
+    async def test_http10_defaults_to_close(self):
+        self.assertEqual(await self.read(b'HTTP/1.0 200 OK\r\n\r\n'), (200, 'OK', False))
+        response = b'HTTP/1.0 200 OK\r\nConnection: keep-alive\r\n\r\n'
+        self.assertEqual(await self.read(response), (200, 'OK', True))
+
+    async def test_skips_informational_responses(self):
+        response = b'HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 103 Early Hints\r\nLink: </a.css>\r\n\r\nHTTP/1.1 204 No Content\r\n\r\n'
+        self.assertEqual(await self.read(response), (204, 'No Content', True))
+
+    async def test_consecutive_responses(self):
+        reader = make_reader(b'HTTP/1.1 200 OK\r\n\r\nHTTP/1.1 301 Moved Permanently\r\nLocation: /b\r\n\r\n')
+        self.assertEqual(await self.checker._read_head_response(reader), (200, 'OK', True))
+        self.assertEqual(await self.checker._read_head_response(reader), (301, 'Moved Permanently', True))
+
+    async def test_malformed_status_line(self):
+        for response in (b'<html>\r\n\r\n', b'HTTP/1.1 OK\r\n\r\n', b'\r\n\r\n'):
+            with self.subTest(response=response):
+                with self.assertRaises(ValueError):
+                    await self.read(response)
+
+    async def test_eof_before_status_line(self):
+        with self.assertRaises(asyncio.IncompleteReadError):
+            await self.read(b'')
+
+    async def test_eof_mid_headers(self):
+        with self.assertRaises(asyncio.IncompleteReadError):
+            await self.read(b'HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n')
+
+
+class PipelineHeadTest(unittest.IsolatedAsyncioTestCase):
+    async def test_malformed_urls_are_left_to_the_regular_path(self):
+        checker = UrlChecker(pipeline=True)
+        resolver = checker._create_resolver()
+        try:
+            for url in ('https://example.com:99999/a', 'https:///a', 'https://a..b.com/a'):
+                with self.subTest(url=url):
+                    self.assertEqual(await checker._pipeline_head(resolver, [url, url]), [None, None])
+        finally:
+            await resolver.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
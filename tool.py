@@ -3,181 +3,698 @@
 Bulk URL Status Checker - Check if multiple URLs are working or broken
 """
 
-import requests
-import concurrent.futures
+import aiohappyeyeballs
+import aiohttp
+import asyncio
 import csv
 import argparse
+import io
+import re
+from array import array
+import socket
+import ssl
 import sys
 from urllib.parse import urlparse
-from collections import defaultdict
+from collections import Counter, defaultdict
 import time
+from yarl import URL
 
-# Disable SSL warnings
-import urllib3
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# aiodns is optional; with it installed, hostnames are resolved without a thread pool
+try:
+    import aiodns
+except ImportError:
+    aiodns = None
+
+# uvloop is optional; with it installed, the checks run on a faster libuv-based event loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Common headers to mimic a browser
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Maximum number of pooled connections to a single host
+PER_HOST_LIMIT = 8
+
+# Seconds a resolved hostname is cached and shared across all lanes
+DNS_CACHE_TTL = 300
+
+# Race IPv6 and IPv4 addresses (RFC 8305), starting the next attempt after this many seconds
+HAPPY_EYEBALLS_DELAY = 0.25
+
+# Retry transient gateway errors and dropped keep-alive connections
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.1
+RETRY_STATUSES = (502, 503, 504)
+
+# Ask for uncompressed bodies on the GET fallback so the range is byte-accurate
+IDENTITY_HEADERS = {'Accept-Encoding': 'identity'}
+
+# Ask for a single byte on the GET fallback so servers don't push the whole body
+RANGE_HEADERS = {**IDENTITY_HEADERS, 'Range': 'bytes=0-0'}
+
+# HEAD answers that may just mean the server rejects HEAD, so GET is tried instead
+HEAD_REJECTED_STATUSES = (403, 405, 501)
+
+# Bodies up to this many bytes are drained so the connection goes back to the pool
+DRAIN_LIMIT = 1024
+
+# Number of HEAD requests written back to back before reading their responses
+PIPELINE_DEPTH = 16
+
+# Headers sent with every pipelined HEAD request, encoded once
+_PIPELINE_HEADERS = ''.join(f"{name}: {value}\r\n" for name, value in DEFAULT_HEADERS.items())
+
+# Minimum number of seconds between progress updates
+PROGRESS_INTERVAL = 0.25
+
+# Result categories, in report order
+CATEGORIES = ('working', 'broken', 'errors')
+WORKING, BROKEN, ERRORS = range(len(CATEGORIES))
+
+# Columns of the CSV report
+CSV_FIELDNAMES = ['url', 'status_code', 'reason', 'response_time', 'is_error', 'error_type', 'redirected', 'redirect_url']
+
+# Matches URLs that already start with a scheme such as http:// or https://
+_SCHEME_RE = re.compile(r'^[a-z][a-z0-9+\-.]*://', re.I)
+
+def _run_async(coro):
+    """Run a coroutine to completion, on uvloop when it is available"""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+def classify(status_code, is_error):
+    """Return the CATEGORIES index of a check outcome"""
+    if is_error:
+        return ERRORS
+    if 200 <= status_code < 400:
+        return WORKING
+    return BROKEN
+
+class CachingResolver(aiohttp.abc.AbstractResolver):
+    """
+    DNS resolver that caches lookups for DNS_CACHE_TTL seconds
+    
+    One instance is shared by the aiohttp connector and the pipelined
+    connections, so each host is looked up once per run whichever path
+    reaches it first. Concurrent lookups of the same host share one query.
+    """
+    def __init__(self, resolver, ttl=DNS_CACHE_TTL):
+        self._resolver = resolver
+        self._ttl = ttl
+        self._cache = {}  # (host, port, family) -> (expires, future)
+    
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        key = (host, port, family)
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry is None or entry[0] < now:
+            future = asyncio.ensure_future(self._resolver.resolve(host, port, family=family))
+            # Retrieve the exception even if every waiter was cancelled
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            entry = self._cache[key] = (now + self._ttl, future)
+        
+        try:
+            return await asyncio.shield(entry[1])
+        except Exception:
+            # Don't cache failed lookups
+            if self._cache.get(key) is entry:
+                del self._cache[key]
+            raise
+    
+    async def close(self):
+        await self._resolver.close()
+
+class Result:
+    """Outcome of checking a single URL"""
+    __slots__ = ('url', 'status_code', 'reason', 'response_time', 'is_error',
+                 'error_type', 'redirected', 'redirect_url', 'final_url')
+    
+    def __init__(self, url):
+        self.url = url
+        self.status_code = None
+        self.reason = None
+        self.response_time = 0.0
+        self.is_error = False
+        self.error_type = None
+        self.redirected = False
+        self.redirect_url = None
+        self.final_url = None
+    
+    def csv_row(self):
+        """Return the fields of the CSV report, in CSV_FIELDNAMES order"""
+        return [
+            self.url, self.status_code, self.reason,
+            round(self.response_time, 2), self.is_error,
+            self.error_type, self.redirected, self.redirect_url
+        ]
+
+class Results:
+    """
+    Results of a check run, stored column by column
+    
+    Status codes, response times and categories are packed into arrays, so
+    each kept result costs a few bytes per column instead of a whole object.
+    """
+    def __init__(self):
+        self.urls = []
+        self.reasons = []
+        self.status_codes = array('H')  # 0 when no response was received
+        self.response_times = array('f')
+        self.categories = array('B')  # Index into CATEGORIES
+        # Sparse columns, keyed by row index
+        self.error_types = {}
+        self.redirect_urls = {}
+        # Per-category totals, kept even when rows are not
+        self.counts = Counter()
+    
+    def __len__(self):
+        return len(self.urls)
+    
+    def append(self, result, category):
+        """Add a Result as a new row, given its CATEGORIES index"""
+        index = len(self.urls)
+        self.urls.append(result.url)
+        self.reasons.append(result.reason)
+        self.status_codes.append(result.status_code or 0)
+        self.response_times.append(result.response_time)
+        self.categories.append(category)
+        if result.is_error:
+            self.error_types[index] = result.error_type
+        if result.redirected:
+            self.redirect_urls[index] = result.redirect_url
+    
+    def indexes(self, category):
+        """Return the row indexes of a category"""
+        wanted = CATEGORIES.index(category)
+        return [i for i, c in enumerate(self.categories) if c == wanted]
+    
+    def csv_row(self, index):
+        """Return the fields of a row, in CSV_FIELDNAMES order"""
+        return [
+            self.urls[index], self.status_codes[index] or None, self.reasons[index],
+            round(self.response_times[index], 2), index in self.error_types,
+            self.error_types.get(index), index in self.redirect_urls,
+            self.redirect_urls.get(index)
+        ]
 
 class UrlChecker:
-    def __init__(self, timeout=10, max_workers=10, verify_ssl=False):
+    def __init__(self, timeout=10, max_workers=10, verify_ssl=False, output_file=None, keep_results=True,
+                 pipeline=False):
         """
         Initialize the URL checker
         
         Args:
             timeout (int): Timeout in seconds for each request
-            max_workers (int): Maximum number of concurrent workers
+            max_workers (int): Maximum number of concurrent requests
             verify_ssl (bool): Whether to verify SSL certificates
+            output_file (str): CSV file to stream results to as they complete
+            keep_results (bool): Whether to keep every result in memory, or only the counts
+            pipeline (bool): Whether to pipeline HEAD requests to hosts with more than 2 * PER_HOST_LIMIT URLs
         """
         self.timeout = timeout
         self.max_workers = max_workers
         self.verify_ssl = verify_ssl
-        self.results = {
-            'working': [],
-            'broken': [],
-            'errors': []
-        }
-        
-        # Set up a requests session for connection pooling
-        self.session = requests.Session()
-        # Set common headers to mimic a browser
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml',
-            'Accept-Language': 'en-US,en;q=0.9',
-        })
+        self.output_file = output_file
+        self.keep_results = keep_results
+        self.pipeline = pipeline
+        # Hosts that rejected HEAD but answered GET; their URLs skip HEAD
+        self._head_disabled = set()
+        self.results = Results()
+        
+        # Keyword arguments shared by every request, built once rather than per call
+        request_kwargs = {'allow_redirects': True, 'timeout': aiohttp.ClientTimeout(total=timeout)}
+        self._head_kwargs = request_kwargs
+        self._range_kwargs = {**request_kwargs, 'headers': RANGE_HEADERS}
+        self._identity_kwargs = {**request_kwargs, 'headers': IDENTITY_HEADERS}
+        
+        # Pipelined requests bypass aiohttp, so they need their own TLS context
+        self._ssl_context = self._create_ssl_context() if pipeline else None
     
     def normalize_url(self, url):
         """Add scheme if missing"""
-        if not urlparse(url).scheme:
-            return f"https://{url}"
-        return url
+        if _SCHEME_RE.match(url):
+            return url
+        return f"https://{url}"
     
-    def check_url(self, url):
+    def _create_ssl_context(self):
+        """Create a TLS context that verifies certificates only if verify_ssl is set"""
+        context = ssl.create_default_context()
+        if not self.verify_ssl:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        return context
+    
+    def _create_resolver(self):
+        """Create the caching resolver shared by a session and its pipelined connections"""
+        return CachingResolver(aiohttp.AsyncResolver() if aiodns else aiohttp.ThreadedResolver())
+    
+    def _create_session(self, resolver):
+        """Create an aiohttp session whose connection pool is sized to max_workers"""
+        connector = aiohttp.TCPConnector(
+            limit=self.max_workers,
+            limit_per_host=PER_HOST_LIMIT,
+            # The shared resolver does the caching, for pipelined connections too
+            use_dns_cache=False,
+            resolver=resolver,
+            happy_eyeballs_delay=HAPPY_EYEBALLS_DELAY,
+            interleave=1,
+            ssl=self.verify_ssl
+        )
+        return aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS)
+    
+    async def _request(self, session, method, url, kwargs):
         """
-        Check a single URL
+        Issue a request, retrying transient failures with exponential backoff
+        
+        Args:
+            session (aiohttp.ClientSession): Session to issue the request with
+            method (str): HTTP method
+            url (str): URL to request
+            kwargs (dict): Prebuilt keyword arguments for session.request
+            
+        Returns:
+            tuple: (status_code, reason, final_url) of the last attempt
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    # aiohttp closes connections whose body was left unread, so
+                    # drain small bodies to keep the connection alive for reuse
+                    length = response.content_length
+                    if method != 'HEAD' and length is not None and length <= DRAIN_LIMIT:
+                        await response.read()
+                    if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        return response.status, response.reason, str(response.url)
+            except aiohttp.ServerDisconnectedError:
+                # The server closed a pooled keep-alive connection under us
+                if attempt == MAX_RETRIES:
+                    raise
+            await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+    
+    async def _get_fallback(self, session, url):
+        """
+        Check a URL with a ranged GET, for servers that reject HEAD
+        
+        A 206 Partial Content answer to the ranged GET counts as working.
+        
+        Returns:
+            tuple: (status_code, reason, final_url)
+        """
+        response = await self._request(session, 'GET', url, self._range_kwargs)
+        # Empty resources can't satisfy the range, so ask again without it
+        if response[0] == 416:
+            response = await self._request(session, 'GET', url, self._identity_kwargs)
+        return response
+    
+    async def _check_url_async(self, session, url, head_status=None):
+        """
+        Check a single (already normalized) URL
         
         Args:
+            session (aiohttp.ClientSession): Session to issue the requests with
             url (str): URL to check
+            head_status (int): HEAD_REJECTED_STATUSES answer already received for
+                this URL (from a pipelined HEAD), so HEAD is not sent again
             
         Returns:
-            dict: Result of the check
-        """
-        url = self.normalize_url(url.strip())
-        result = {
-            'url': url,
-            'original_url': url,
-            'status_code': None,
-            'reason': None,
-            'is_error': False,
-            'error_type': None,
-            'response_time': 0
-        }
+            Result: Result of the check
+        """
+        result = Result(url)
         
         try:
-            start_time = time.time()
-            # Use HEAD request first (faster) then fall back to GET if method not allowed
-            response = self.session.head(
-                url, 
-                timeout=self.timeout,
-                allow_redirects=True,
-                verify=self.verify_ssl
-            )
-            
-            # Some servers don't support HEAD, so try GET if we get 405 Method Not Allowed
-            if response.status_code == 405:
-                response = self.session.get(
-                    url, 
-                    timeout=self.timeout,
-                    allow_redirects=True,
-                    verify=self.verify_ssl,
-                    stream=True  # Don't download the whole content
-                )
-                # Close the connection immediately
-                response.close()
+            start_time = time.perf_counter()
+            host = urlparse(url).netloc
+            
+            if host in self._head_disabled:
+                # This host is known to reject HEAD, so don't waste a round trip on it
+                status_code, reason, final_url = await self._get_fallback(session, url)
+            else:
+                if head_status is None:
+                    # Use HEAD request first (faster) then fall back to GET if HEAD is rejected
+                    status_code, reason, final_url = await self._request(
+                        session, 'HEAD', url, self._head_kwargs
+                    )
+                else:
+                    status_code, reason, final_url = head_status, None, url
                 
-            result['response_time'] = round(time.time() - start_time, 2)
-            result['status_code'] = response.status_code
-            result['reason'] = response.reason
-            result['final_url'] = response.url  # In case of redirects
+                # Some servers don't support HEAD (405 Method Not Allowed, 501, or a WAF's 403)
+                if status_code in HEAD_REJECTED_STATUSES:
+                    head_status = status_code
+                    status_code, reason, final_url = await self._get_fallback(session, url)
+                    # GET got a different answer, so it was HEAD itself that was refused
+                    if status_code != head_status:
+                        self._head_disabled.add(host)
+            
+            result.response_time = time.perf_counter() - start_time
+            result.status_code = status_code
+            result.reason = reason
+            result.final_url = final_url  # In case of redirects
             
             # Check if we got redirected
-            if response.url != url:
-                result['redirected'] = True
-                result['redirect_url'] = response.url
+            if final_url != url:
+                result.redirected = True
+                result.redirect_url = final_url
             
-        except requests.exceptions.RequestException as e:
-            result['is_error'] = True
-            result['error_type'] = type(e).__name__
-            result['reason'] = str(e)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            result.is_error = True
+            result.error_type = type(e).__name__
+            result.reason = str(e) or type(e).__name__
         
         return result
     
-    def check_urls(self, urls):
+    def check_url(self, url):
         """
-        Check multiple URLs in parallel
+        Check a single URL
         
         Args:
-            urls (list): List of URLs to check
+            url (str): URL to check
             
         Returns:
-            dict: Results categorized as working, broken, and errors
+            Result: Result of the check
         """
-        results = defaultdict(list)
+        async def run():
+            resolver = self._create_resolver()
+            try:
+                async with self._create_session(resolver) as session:
+                    return await self._check_url_async(session, self.normalize_url(url.strip()))
+            finally:
+                await resolver.close()
         
-        print(f"Checking {len(urls)} URLs with {self.max_workers} workers...")
+        return _run_async(run())
+    
+    async def _open_connection(self, resolver, url):
+        """
+        Open a stream connection to the host of a URL
+        
+        The host's IPv6 and IPv4 addresses are raced (happy eyeballs), so a
+        broken IPv6 path doesn't cost a full connect timeout.
+        
+        Args:
+            resolver (CachingResolver): Resolver shared with the session
+            url (URL): URL whose host and port to connect to
+            
+        Returns:
+            tuple: (reader, writer) streams
+        """
+        hosts = await resolver.resolve(url.raw_host, url.port, family=socket.AF_UNSPEC)
+        addr_infos = [
+            (socket.AF_INET6, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', (h['host'], h['port'], 0, 0))
+            if ':' in h['host'] else
+            (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', (h['host'], h['port']))
+            for h in hosts
+        ]
+        sock = await aiohappyeyeballs.start_connection(
+            addr_infos, happy_eyeballs_delay=HAPPY_EYEBALLS_DELAY, interleave=1
+        )
+        
+        try:
+            if url.scheme == 'https':
+                return await asyncio.open_connection(
+                    sock=sock, ssl=self._ssl_context, server_hostname=url.raw_host
+                )
+            return await asyncio.open_connection(sock=sock)
+        except BaseException:
+            sock.close()
+            raise
+    
+    async def _read_head_response(self, reader):
+        """
+        Read the status line and headers of one response to a HEAD request
+        
+        Returns:
+            tuple: (status_code, reason, keep_alive)
+        """
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise asyncio.IncompleteReadError(line, None)
+            version, _, status = line.decode('latin-1').rstrip('\r\n').partition(' ')
+            if not version.startswith('HTTP/'):
+                raise ValueError(f"Malformed status line: {line!r}")
+            code, _, reason = status.partition(' ')
+            status_code = int(code)
+            keep_alive = version != 'HTTP/1.0'
+            
+            # Responses to HEAD have no body, so the headers end the response
+            while True:
+                header = await reader.readline()
+                if not header:
+                    raise asyncio.IncompleteReadError(header, None)
+                if header in (b'\r\n', b'\n'):
+                    break
+                name, _, value = header.decode('latin-1').partition(':')
+                if name.strip().lower() == 'connection':
+                    keep_alive = value.strip().lower() != 'close'
+            
+            # Skip informational responses; the real one follows
+            if status_code >= 200:
+                return status_code, reason, keep_alive
+    
+    async def _pipeline_head(self, resolver, urls):
+        """
+        Check URLs on one host with pipelined HEAD requests over a single connection
+        
+        Requests are written PIPELINE_DEPTH at a time, and responses are paired
+        with them by order. URLs that got no answer, or an answer that needs the
+        regular path (redirects, transient errors), get None. HEAD rejections
+        are kept, so the caller can go straight to the GET fallback.
+        
+        Args:
+            resolver (CachingResolver): Resolver shared with the session
+            urls (list): Normalized URLs sharing one scheme and host
+            
+        Returns:
+            list: A Result or None for each URL, in order
+        """
+        results = [None] * len(urls)
+        try:
+            first = URL(urls[0])
+            raw_host, port = first.raw_host, first.port
+        except ValueError:
+            # Malformed URLs (e.g. an out of range port) are reported by the regular path
+            return results
+        if not raw_host:
+            return results
+        
+        host = f"[{raw_host}]" if ':' in raw_host else raw_host
+        if not first.is_default_port():
+            host = f"{host}:{port}"
+        
+        try:
+            reader, writer = await asyncio.wait_for(self._open_connection(resolver, first), self.timeout)
+        except (OSError, ValueError, asyncio.TimeoutError):
+            # Let the regular path report the connection or resolution error
+            # (hostnames that can't be IDNA-encoded raise UnicodeError, a ValueError)
+            return results
+        
+        try:
+            for start in range(0, len(urls), PIPELINE_DEPTH):
+                batch = urls[start:start + PIPELINE_DEPTH]
+                start_time = time.perf_counter()
+                writer.write(''.join(
+                    f"HEAD {URL(url).raw_path_qs} HTTP/1.1\r\nHost: {host}\r\n{_PIPELINE_HEADERS}\r\n"
+                    for url in batch
+                ).encode('latin-1'))
+                await writer.drain()
+                
+                for offset, url in enumerate(batch):
+                    status_code, reason, keep_alive = await asyncio.wait_for(
+                        self._read_head_response(reader), self.timeout
+                    )
+                    if not (300 <= status_code < 400 or status_code in RETRY_STATUSES):
+                        result = Result(url)
+                        result.status_code = status_code
+                        result.reason = reason
+                        result.response_time = time.perf_counter() - start_time
+                        result.final_url = url
+                        results[start + offset] = result
+                    if not keep_alive:
+                        # The server won't answer the rest of the pipeline
+                        return results
+        except (OSError, ValueError, UnicodeError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            # Whatever is left unanswered goes through the regular path
+            pass
+        finally:
+            # Wait for the close so TLS shutdown finishes before the loop does
+            writer.close()
+            try:
+                await asyncio.wait_for(writer.wait_closed(), self.timeout)
+            except (OSError, asyncio.TimeoutError):
+                pass
+        
+        return results
+    
+    def _group_by_host(self, urls):
+        """
+        Split normalized URLs into per-host lanes
+        
+        Each host gets at most PER_HOST_LIMIT lanes. A lane is checked
+        sequentially, so all of its requests reuse one keep-alive connection.
         
-        # Process URLs in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_url = {executor.submit(self.check_url, url): url for url in urls}
+        Args:
+            urls (iterable): Normalized URLs to group
             
-            # Show progress
-            total = len(future_to_url)
-            completed = 0
+        Returns:
+            list: Lists of URLs that share a scheme and host
+        """
+        buckets = defaultdict(list)
+        for url in urls:
+            buckets[urlparse(url)[:2]].append(url)
+        
+        lanes = []
+        for host_urls in buckets.values():
+            lane_count = min(PER_HOST_LIMIT, len(host_urls))
+            lanes.extend(host_urls[i::lane_count] for i in range(lane_count))
+        return lanes
+    
+    async def _check_urls_async(self, urls, writer=None):
+        """Check multiple URLs concurrently on a single event loop"""
+        results = Results()
+        # Check each distinct URL once, but report it once per occurrence in the input
+        occurrences = Counter(self.normalize_url(url.strip()) for url in urls)
+        lanes = self._group_by_host(occurrences)
+        
+        # Show progress
+        total = len(urls)
+        completed = 0
+        last_print = 0.0
+        
+        def record(result):
+            nonlocal completed, last_print
+            count = occurrences[result.url]
+            completed += count
+            # Throttle by time, not by count, so fast runs don't flood the terminal
+            now = time.monotonic()
+            if now - last_print >= PROGRESS_INTERVAL or completed == total:
+                sys.stdout.write(f"Progress: {completed}/{total} URLs checked\r")
+                sys.stdout.flush()
+                last_print = now
             
-            for future in concurrent.futures.as_completed(future_to_url):
-                completed += 1
-                if completed % 10 == 0 or completed == total:
-                    print(f"Progress: {completed}/{total} URLs checked", end='\r')
+            category = classify(result.status_code, result.is_error)
+            results.counts[CATEGORIES[category]] += count
+            if self.keep_results:
+                for _ in range(count):
+                    results.append(result, category)
+            if writer is not None:
+                row = result.csv_row()
+                writer.writerows([row] * count)
+        
+        resolver = self._create_resolver()
+        try:
+            async with self._create_session(resolver) as session:
+                # A fixed set of workers pulls lanes off a shared iterator, so only
+                # max_workers coroutines exist at once however many lanes there are
+                pending = iter(lanes)
                 
-                result = future.result()
+                async def worker():
+                    for lane in pending:
+                        # The first URL takes the regular path, which learns whether
+                        # the host rejects HEAD before the rest is pipelined
+                        record(await self._check_url_async(session, lane[0]))
+                        rest = lane[1:]
+                        
+                        answered = [None] * len(rest)
+                        if self.pipeline and len(rest) > 1 and urlparse(lane[0]).netloc not in self._head_disabled:
+                            answered = await self._pipeline_head(resolver, rest)
+                        
+                        for url, result in zip(rest, answered):
+                            if result is None:
+                                result = await self._check_url_async(session, url)
+                            elif result.status_code in HEAD_REJECTED_STATUSES:
+                                # The pipelined HEAD was refused, so only the GET fallback is left
+                                result = await self._check_url_async(session, url, result.status_code)
+                            record(result)
                 
-                if result['is_error']:
-                    results['errors'].append(result)
-                elif 200 <= result['status_code'] < 400:
-                    results['working'].append(result)
-                else:
-                    results['broken'].append(result)
+                workers = min(self.max_workers, len(lanes))
+                await asyncio.gather(*(worker() for _ in range(workers)))
+        finally:
+            await resolver.close()
+        
+        return results
+    
+    def check_urls(self, urls):
+        """
+        Check multiple URLs concurrently
+        
+        Args:
+            urls (list): List of URLs to check
+            
+        Returns:
+            Results: Results categorized as working, broken, and errors
+        """
+        print(f"Checking {len(urls)} URLs with {self.max_workers} workers...")
+        
+        if self.output_file:
+            # Stream rows to the report as results come in
+            with open(self.output_file, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(CSV_FIELDNAMES)
+                results = _run_async(self._check_urls_async(urls, writer))
+        else:
+            results = _run_async(self._check_urls_async(urls))
         
         print("\nCheck completed!")
+        if self.output_file:
+            print(f"Report saved to {self.output_file}")
         return results
     
     def print_results(self, results=None):
         """Print the results to the console"""
         if results is None:
             results = self.results
-            
-        print("\n===== URL CHECK RESULTS =====\n")
+        
+        # Build the whole report in memory and write it to stdout once
+        buf = io.StringIO()
+        
+        print("\n===== URL CHECK RESULTS =====\n", file=buf)
+        
+        urls, codes, reasons = results.urls, results.status_codes, results.reasons
         
         # Print working URLs
-        print(f"WORKING URLs: {len(results['working'])}")
-        for result in results['working']:
-            print(f"  ✓ {result['url']} - {result['status_code']} {result['reason']} ({result['response_time']}s)")
+        print(f"WORKING URLs: {results.counts['working']}", file=buf)
+        for i in results.indexes('working'):
+            print(f"  ✓ {urls[i]} - {codes[i]} {reasons[i]} ({results.response_times[i]:.2f}s)", file=buf)
         
         # Print broken URLs
-        print(f"\nBROKEN URLs: {len(results['broken'])}")
-        for result in results['broken']:
-            print(f"  ✗ {result['url']} - {result['status_code']} {result['reason']}")
+        print(f"\nBROKEN URLs: {results.counts['broken']}", file=buf)
+        for i in results.indexes('broken'):
+            print(f"  ✗ {urls[i]} - {codes[i]} {reasons[i]}", file=buf)
         
         # Print errors
-        print(f"\nERRORS: {len(results['errors'])}")
-        for result in results['errors']:
-            print(f"  ! {result['url']} - {result['error_type']}: {result['reason']}")
-            
-        # Print summary
-        total = len(results['working']) + len(results['broken']) + len(results['errors'])
-        print(f"\n===== SUMMARY =====")
-        print(f"Total URLs checked: {total}")
-        print(f"Working: {len(results['working'])} ({round(len(results['working'])/total*100, 1)}%)")
-        print(f"Broken: {len(results['broken'])} ({round(len(results['broken'])/total*100, 1)}%)")
-        print(f"Errors: {len(results['errors'])} ({round(len(results['errors'])/total*100, 1)}%)")
+        print(f"\nERRORS: {results.counts['errors']}", file=buf)
+        for i in results.indexes('errors'):
+            print(f"  ! {urls[i]} - {results.error_types[i]}: {reasons[i]}", file=buf)
+        
+        self._write_summary(results, buf)
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+    
+    def print_summary(self, results=None):
+        """Print the number of working, broken, and error URLs"""
+        if results is None:
+            results = self.results
+        
+        buf = io.StringIO()
+        self._write_summary(results, buf)
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+    
+    def _write_summary(self, results, buf):
+        """Write the summary section of the report to buf"""
+        counts = results.counts
+        total = counts['working'] + counts['broken'] + counts['errors']
+        print(f"\n===== SUMMARY =====", file=buf)
+        print(f"Total URLs checked: {total}", file=buf)
+        print(f"Working: {counts['working']} ({round(counts['working']/total*100, 1)}%)", file=buf)
+        print(f"Broken: {counts['broken']} ({round(counts['broken']/total*100, 1)}%)", file=buf)
+        print(f"Errors: {counts['errors']} ({round(counts['errors']/total*100, 1)}%)", file=buf)
     
     def save_csv_report(self, filename, results=None):
         """Save the results to a CSV file"""
@@ -185,17 +702,14 @@ class UrlChecker:
             results = self.results
             
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['url', 'status_code', 'reason', 'response_time', 'is_error', 'error_type', 'redirected', 'redirect_url']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.writer(csvfile)
             
-            writer.writeheader()
+            writer.writerow(CSV_FIELDNAMES)
             
-            # Write all results
-            for category in ['working', 'broken', 'errors']:
-                for result in results[category]:
-                    # Only write the fields we want
-                    row = {field: result.get(field, '') for field in fieldnames}
-                    writer.writerow(row)
+            # Write all results in category order, with a single stable sort
+            # instead of one scan of the rows per category
+            order = sorted(range(len(results)), key=results.categories.__getitem__)
+            writer.writerows(map(results.csv_row, order))
                     
         print(f"Report saved to {filename}")
 
@@ -214,17 +728,22 @@ def main():
     parser = argparse.ArgumentParser(description='Bulk URL Status Checker')
     parser.add_argument('file', nargs='?', help='File containing URLs (one per line)')
     parser.add_argument('-t', '--timeout', type=int, default=10, help='Timeout in seconds (default: 10)')
-    parser.add_argument('-w', '--workers', type=int, default=10, help='Maximum number of workers (default: 10)')
+    parser.add_argument('-w', '--workers', type=int, default=10, help='Maximum number of concurrent requests (default: 10)')
     parser.add_argument('-o', '--output', default='url_check_results.csv', help='Output CSV file (default: url_check_results.csv)')
     parser.add_argument('-v', '--verify-ssl', action='store_true', help='Verify SSL certificates (default: False)')
+    parser.add_argument('-p', '--pipeline', action='store_true', help=f'Pipeline HEAD requests to hosts with more than {2 * PER_HOST_LIMIT} distinct URLs; not every server supports it (default: False)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only print the summary, without keeping per-URL results in memory (default: False)')
     
     args = parser.parse_args()
     
-    # Create URL checker
+    # Create URL checker, streaming the CSV report while checking
     checker = UrlChecker(
         timeout=args.timeout,
         max_workers=args.workers,
-        verify_ssl=args.verify_ssl
+        verify_ssl=args.verify_ssl,
+        output_file=args.output,
+        keep_results=not args.quiet,
+        pipeline=args.pipeline
     )
     
     urls = []
@@ -242,10 +761,10 @@ def main():
     results = checker.check_urls(urls)
     
     # Print results
-    checker.print_results(results)
-    
-    # Save CSV report
-    checker.save_csv_report(args.output, results)
+    if args.quiet:
+        checker.print_summary(results)
+    else:
+        checker.print_results(results)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file